@@ -1,5 +1,24 @@
 import os
 
+def read_file_into(view, file_path):
+    """
+    Read the raw bytes of a file directly into a slice of the output buffer.
+    Raises an exception if the file size no longer matches the region.
+    
+    :param view: memoryview of the buffer region reserved for the file
+    :param file_path: Path of the file to read
+    """
+    with open(file_path, 'rb', buffering=0) as infile:
+        while view:
+            read = infile.readinto(view)
+            if not read:
+                raise Exception(f"File shrank while merging: {file_path}")
+            view = view[read:]
+
+        # The file must end exactly where its region does, otherwise it grew since its size was taken
+        if infile.read(1):
+            raise Exception(f"File grew while merging: {file_path}")
+
 def merge_python_files(input_folder, output_file):
     """
     Merge all Python files in the specified folder into a single executable file.
@@ -12,29 +31,45 @@ def merge_python_files(input_folder, output_file):
     main_file = None
     
     # Scan the folder to gather all .py files
-    for file_name in os.listdir(input_folder):
-        file_path = os.path.join(input_folder, file_name)
-        if os.path.isfile(file_path) and file_name.endswith('.py'):
-            if file_name == 'main.py':
-                main_file = file_path  # Store the main.py file
-            else:
-                py_files.append(file_path)
+    with os.scandir(input_folder) as entries:
+        for entry in entries:
+            # Check the name first, it is cheaper than querying the file type
+            if entry.name.endswith('.py') and entry.is_file():
+                if entry.name == 'main.py':
+                    main_file = entry.path  # Store the main.py file
+                else:
+                    py_files.append(entry.path)
     
-    # Write the contents of all files to the output file
-    with open(output_file, 'w') as outfile:
-        # Add non-main.py files
-        for file_path in py_files:
-            with open(file_path, 'r') as infile:
-                outfile.write(f"# File: {os.path.basename(file_path)}\n")
-                outfile.write(infile.read())
-                outfile.write("\n\n")
-        
-        # Add main.py at the end if it exists
-        if main_file:
-            with open(main_file, 'r') as infile:
-                outfile.write(f"# File: {os.path.basename(main_file)}\n")
-                outfile.write(infile.read())
-                outfile.write("\n")
+    # Lay out the merged content: a header, the file contents and a separator for each file
+    # The main.py file, if present, is placed last and followed by a single newline
+    layout = [(file_path, b"\n\n") for file_path in py_files]
+    if main_file:
+        layout.append((main_file, b"\n"))
+
+    # Reserve a buffer sized to the whole merged content so it can be written with a single call
+    sizes = [os.path.getsize(file_path) for file_path, _ in layout]
+    headers = [b"# File: " + os.fsencode(os.path.basename(file_path)) + b"\n" for file_path, _ in layout]
+    buffer = bytearray(sum(sizes) + sum(map(len, headers)) + sum(len(separator) for _, separator in layout))
+    view = memoryview(buffer)
+
+    # Write the headers and separators, and note where the contents of each file go
+    regions = []
+    offset = 0
+    for (file_path, separator), size, header in zip(layout, sizes, headers):
+        view[offset:offset + len(header)] = header
+        offset += len(header)
+        regions.append(view[offset:offset + size])
+        offset += size
+        view[offset:offset + len(separator)] = separator
+        offset += len(separator)
+
+    # Read each file into its own region of the buffer
+    for region, (file_path, _) in zip(regions, layout):
+        read_file_into(region, file_path)
+
+    # Write the merged content to the output file in one go
+    with open(output_file, 'wb', buffering=0) as outfile:
+        outfile.write(buffer)
 
     print(f"Merging completed. File created: {output_file}")
 
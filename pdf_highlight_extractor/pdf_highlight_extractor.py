@@ -39,29 +39,43 @@ class PDFHighlightExtractor(tk.Tk):
 		else:
 			self.text_area.insert(tk.END, "No PDF file selected.\n")
 
+def words_in_rect(words, rx0, ry0, rx1, ry1):
+	# A word belongs to a highlight if the highlighted rectangle covers any part of its width,
+	# and at least half of its height so the lines touching the highlight are left out
+	texts = []
+	for x0, y0, x1, y1, text in words:
+		# Skip words on other lines before testing the width
+		if y1 <= ry0 or y0 >= ry1:
+			continue
+		if min(x1, rx1) > max(x0, rx0) and min(y1, ry1) - max(y0, ry0) >= 0.5 * (y1 - y0):
+			texts.append(text)
+	return texts
+
 def extract_highlighted_text(pdf_path, output_file):
 	highlighted_texts = []
 	with fitz.open(pdf_path) as doc:
 		for page in doc:
-			annotations = page.annots()
-			if annotations:
-				for annot in annotations:
-					if annot.type[0] == 8:  # Highlight annotation type
-						# Initialize an accumulator for the text in this annotation
-						annotation_text = ""
-						quads = annot.vertices
-						for i in range(0, len(quads), 4):
-							quad = fitz.Quad(quads[i: i + 4])
-							rect = quad.rect
-							text = page.get_text("text", clip=rect).strip()
-							annotation_text += text + " "  # Accumulate the text
+			words = None
+			for annot in page.annots(types=(fitz.PDF_ANNOT_HIGHLIGHT,)):
+				# Extract the words of the page once, and only if it has highlights, as plain coordinates and text
+				if words is None:
+					words = [(w[0], w[1], w[2], w[3], w[4]) for w in page.get_text("words")]
+
+				# Initialize an accumulator for the text in this annotation
+				annotation_text = ""
+				quads = annot.vertices
+				for i in range(0, len(quads), 4):
+					rect = fitz.Quad(quads[i: i + 4]).rect
+					quad_words = words_in_rect(words, rect.x0, rect.y0, rect.x1, rect.y1)
+					annotation_text += " ".join(quad_words) + " "  # Accumulate the text
 
-						# Add the complete text of this annotation to the list
-						highlighted_texts.append(annotation_text + "\n")
+				# Add the complete text of this annotation to the list
+				highlighted_texts.append(annotation_text + "\n")
 
+	# Write all the highlights at once, each followed by an empty line
 	with open(output_file, 'w', encoding='utf-8') as file:
-		for text in highlighted_texts:
-			file.write(text + "\n")
+		if highlighted_texts:
+			file.write("\n".join(highlighted_texts) + "\n")
 
 if __name__ == "__main__":
 	app = PDFHighlightExtractor()
@@ -1,11 +1,28 @@
 import os
 import shutil
 
+def find_cache_dirs(root_dir):
+    # Walk the tree with os.scandir, yielding every __pycache__ directory found
+    stack = [root_dir]
+    while stack:
+        current_dir = stack.pop()
+        try:
+            entries = os.scandir(current_dir)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name == "__pycache__":
+                        yield entry.path
+                    else:
+                        stack.append(entry.path)
+
 def cleanup():
-    # Cleanup the Python __pycache__ directory
-    try:
-        cache_dir = "__pycache__"
-        if os.path.exists(cache_dir):
+    # Cleanup the Python __pycache__ directories of the script, including nested ones
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    for cache_dir in find_cache_dirs(script_dir):
+        try:
             shutil.rmtree(cache_dir)
-    except Exception as e:
-        print(f"Error deleting cache directory: {e}")
+        except Exception as e:
+            print(f"Error deleting cache directory: {e}")
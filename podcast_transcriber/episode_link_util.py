@@ -1,11 +1,144 @@
-import requests
-import feedparser
+import os
+import re
+import json
+import html
 import difflib
+from html.entities import html5
+from contextlib import closing
+from lxml import etree
+from session_util import session, REQUEST_TIMEOUT
 
-def episode_link(podcast_id, episode_title_parsed, episode_title_real):
+# Size (in bytes) of the chunks the RSS feed is read and parsed in
+FEED_CHUNK_SIZE = 1 << 16
+
+# Minimum similarity between titles for a feed item to be considered the episode
+MATCH_THRESHOLD = 0.6
+
+# Named character reference such as &rsquo;, which XML does not define unless it is one of its own five
+HTML_ENTITY_RE = re.compile(rb'&(?!(?:amp|lt|gt|quot|apos);)([A-Za-z][A-Za-z0-9]{1,31});')
+
+# Numeric character references the XML parser understands, for every HTML named entity
+HTML_ENTITY_REFS = {
+    name[:-1].encode('ascii'): "".join(f"&#{ord(c)};" for c in text).encode('ascii')
+    for name, text in html5.items() if name.endswith(';')
+}
+
+def title_similarity(title_lower, entry_title, min_ratio):
+    # Compute the full similarity only if its cheap upper bounds show it can exceed min_ratio
+    matcher = difflib.SequenceMatcher(None, title_lower, entry_title)
+    if matcher.real_quick_ratio() <= min_ratio or matcher.quick_ratio() <= min_ratio:
+        return 0.0
+    return matcher.ratio()
+
+def stream_rss_feed(rss_feed_url, podcast_id, feed_dir):
+    # Yield the RSS feed in chunks as they are downloaded, or from the cached copy if it has not changed
+
+    # Paths of the cached feed and of its validators (ETag and Last-Modified)
+    feed_path = os.path.join(feed_dir, f"{podcast_id}.xml")
+    validators_path = os.path.join(feed_dir, f"{podcast_id}.json")
+
+    # Ask the server to send the feed only if it changed since it was cached
+    headers = {}
+    try:
+        with open(validators_path, "r", encoding="utf-8") as f:
+            validators = json.load(f)
+        if validators.get('feed_url') == rss_feed_url and os.path.exists(feed_path):
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+    except (OSError, ValueError):
+        pass
+
+    # Stream the RSS feed, letting requests undo any content encoding
+    with session.get(rss_feed_url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as feed_response:
+        if feed_response.status_code == 304:
+            # The cached feed is still up to date
+            with open(feed_path, "rb") as f:
+                while True:
+                    chunk = f.read(FEED_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+            return
+        if feed_response.status_code != 200:
+            raise Exception(f"Error fetching RSS feed: {feed_response.status_code}")
+
+        # Save the feed to a temporary file first, so an interrupted download never replaces a valid cache
+        os.makedirs(feed_dir, exist_ok=True)
+        temp_path = feed_path + ".tmp"
+        chunks = feed_response.iter_content(chunk_size=FEED_CHUNK_SIZE)
+        completed = False
+        try:
+            with open(temp_path, "wb") as f:
+                try:
+                    for chunk in chunks:
+                        f.write(chunk)
+                        yield chunk
+                except GeneratorExit:
+                    # The episode was found before the end of the feed: finish the download without parsing
+                    # so the whole feed is cached, giving up on the cache if it fails since the match is already made
+                    try:
+                        for chunk in chunks:
+                            f.write(chunk)
+                    except Exception:
+                        return
+            completed = True
+        finally:
+            # Drop the partial copy of an interrupted download, leaving the cached feed as it was
+            if not completed:
+                feed_response.close()
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+        # Replace the cached feed and store the validators needed for the next conditional request
+        try:
+            os.replace(temp_path, feed_path)
+            with open(validators_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    'feed_url': rss_feed_url,
+                    'etag': feed_response.headers.get('ETag'),
+                    'last_modified': feed_response.headers.get('Last-Modified'),
+                }, f)
+        except OSError as e:
+            print(f"Error caching RSS feed: {e}")
+
+def replace_html_entity(match):
+    # Rewrite an HTML named entity as numeric character references, leaving unknown entities untouched
+    return HTML_ENTITY_REFS.get(match.group(1), match.group(0))
+
+def html_entities_to_xml(chunks):
+    # Make the HTML entities found in hand-made feeds readable by the XML parser, which would otherwise
+    # cut the text at the first one, holding back a trailing entity that may continue in the next chunk
+    tail = b""
+    for chunk in chunks:
+        chunk = tail + chunk
+        amp = chunk.rfind(b"&", max(0, len(chunk) - 33))
+        if amp != -1 and b";" not in chunk[amp:]:
+            chunk, tail = chunk[:amp], chunk[amp:]
+        else:
+            tail = b""
+        yield HTML_ENTITY_RE.sub(replace_html_entity, chunk)
+    if tail:
+        yield tail
+
+def iter_feed_items(chunks):
+    # Feed the chunks to an incremental XML parser, yielding each <item> as soon as it is complete
+    parser = etree.XMLPullParser(events=('end',), tag='item', recover=True, resolve_entities=False)
+    for chunk in html_entities_to_xml(chunks):
+        parser.feed(chunk)
+        for _, item in parser.read_events():
+            yield item
+    parser.close()
+    for _, item in parser.read_events():
+        yield item
+
+def episode_link(podcast_id, episode_title_parsed, episode_title_real, feed_dir):
     # Use iTunes Search API to get podcast details
     url = f"https://itunes.apple.com/lookup?id={podcast_id}"
-    response = requests.get(url)
+    response = session.get(url, timeout=REQUEST_TIMEOUT)
     
     if response.status_code != 200:
         raise Exception(f"Error fetching podcast details: {response.status_code}")
@@ -17,37 +150,50 @@ def episode_link(podcast_id, episode_title_parsed, episode_title_real):
         rss_feed_url = data['results'][0].get('feedUrl', None)
         
         if rss_feed_url:
-            # Parse the RSS feed
-            feed = feedparser.parse(rss_feed_url)
-            
-            best_match = None
-            best_ratio = 0.0
-
-            # Try to find the episode using either episode_title_parsed or episode_title_real
-            for entry in feed.entries:
-                entry_title = entry.title.lower()
-                episode_title_parsed_lower = episode_title_parsed.lower()
-                episode_title_real_lower = episode_title_real.lower()
+            # Only items above the similarity threshold can be the episode
+            best_link = None
+            best_ratio = MATCH_THRESHOLD
+            episode_title_parsed_lower = episode_title_parsed.lower()
+            episode_title_real_lower = episode_title_real.lower()
+
+            # Try to find the episode using either episode_title_parsed or episode_title_real,
+            # parsing the RSS feed one <item> at a time while it is being downloaded
+            with closing(stream_rss_feed(rss_feed_url, podcast_id, feed_dir)) as chunks:
+                for entry in iter_feed_items(chunks):
+                    # Read the title and links of the item in a single pass over its children
+                    entry_title, entry_link, enclosure_url = "", "", ""
+                    for child in entry:
+                        if child.tag == 'title':
+                            # Entities inside a CDATA section are left as text by the parser
+                            entry_title = html.unescape(child.text or "").strip().lower()
+                        elif child.tag == 'link':
+                            entry_link = (child.text or "").strip()
+                        elif child.tag == 'enclosure' and not enclosure_url:
+                            enclosure_url = child.get('url', "")
                 
-                # Compare the episode title with parsed and real titles using difflib
-                ratio_parsed = difflib.SequenceMatcher(None, episode_title_parsed_lower, entry_title).ratio()
-                ratio_real = difflib.SequenceMatcher(None, episode_title_real_lower, entry_title).ratio()
-
-                # Keep track of the best match
-                if ratio_parsed > best_ratio:
-                    best_ratio = ratio_parsed
-                    best_match = entry
-                if ratio_real > best_ratio:
-                    best_ratio = ratio_real
-                    best_match = entry
+                    # Compare the episode title with parsed and real titles using difflib, skipping hopeless items
+                    ratio_parsed = title_similarity(episode_title_parsed_lower, entry_title, best_ratio)
+                    ratio_real = title_similarity(episode_title_real_lower, entry_title, max(best_ratio, ratio_parsed))
+                    ratio = max(ratio_parsed, ratio_real)
+
+                    # Keep track of the best match, preferring the direct link to the audio file in the enclosure
+                    if ratio > best_ratio:
+                        best_ratio = ratio
+                        best_link = enclosure_url or entry_link
+
+                    # Free the item and the ones already processed to keep memory flat
+                    entry.clear()
+                    while entry.getprevious() is not None:
+                        del entry.getparent()[0]
+
+                    # No later item can beat an exact match, so stop parsing the feed
+                    if best_ratio == 1.0:
+                        break
                 
-            # If a good enough match is found, return the enclosure link if available
-            if best_match and best_ratio > 0.6:  # 60% similarity threshold
-                if 'enclosures' in best_match and len(best_match.enclosures) > 0:
-                    # Return the direct link to the audio file in the enclosure
-                    return best_match.enclosures[0].href
-                elif hasattr(best_match, 'link'):
-                    return best_match.link
+            # If a good enough match is found, return its link if available
+            if best_link is not None:
+                if best_link:
+                    return best_link
             else:
                 raise Exception("Episode not found in the RSS feed.")
         else:
@@ -12,6 +12,7 @@ def main(podcast_url):
         model_dir = "models"
         audio_dir = "audios"
         transcript_dir = "transcripts"
+        feed_dir = "feeds"
 
         # Get the podcast title from the Apple Podcast URL
         podcast_id, episode_title_parsed, episode_title_real = podcast_info(podcast_url)
@@ -20,7 +21,7 @@ def main(podcast_url):
         print(f"-- Podcast ID: {podcast_id}")
 
         # Get the RSS feed URL from the iTunes API and find the original episode link
-        episode_fetched = episode_link(podcast_id, episode_title_parsed, episode_title_real)
+        episode_fetched = episode_link(podcast_id, episode_title_parsed, episode_title_real, feed_dir)
         print("Episode link fetched successfully.")
         print(f"-- Episode link: {episode_fetched}")
 
@@ -1,31 +1,37 @@
-import requests
-from bs4 import BeautifulSoup
+import re
+from lxml import html
+from session_util import session, REQUEST_TIMEOUT
+
+# Apple Podcasts episode URL, capturing the parsed episode title and the podcast ID
+APPLE_PODCAST_URL_RE = re.compile(r'\Ahttps?://(?:podcasts|itunes)\.apple\.com/(?:[^/?#]+/)?podcast/([^/?#]+)/id(\d+)')
 
 def podcast_info(podcast_url):
-    # Extract the podcast ID from the Apple Podcasts URL
-    podcast_id = podcast_url.split('/id')[-1].split('?')[0]
-    
-    # Extract the parsed episode title from the URL
-    episode_title_parsed = podcast_url.split('/podcast/')[-1].split('/id')[0]
+    # Extract the parsed episode title and the podcast ID from the Apple Podcasts URL
+    match = APPLE_PODCAST_URL_RE.match(podcast_url.strip())
+    if not match:
+        raise Exception(f"Invalid Apple Podcasts URL: {podcast_url}")
+    episode_title_parsed, podcast_id = match.groups()
     
     # Make a request to the Apple Podcasts page to retrieve the actual episode title
-    response = requests.get(podcast_url)
+    response = session.get(podcast_url, timeout=REQUEST_TIMEOUT)
     
     if response.status_code == 200:
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Decode the page with the charset declared by the server, if any, or let lxml detect it
+        charset = response.encoding if 'charset=' in response.headers.get('Content-Type', '').lower() else None
+        page = html.fromstring(response.content, parser=html.HTMLParser(encoding=charset))
         
         # Try to find the episode title in an <h1> tag
-        episode_title_real = soup.find('h1')
-        if episode_title_real:
-            episode_title_real = episode_title_real.text.strip()
+        h1_tag = page.find('.//h1')
+        if h1_tag is not None:
+            episode_title_real = h1_tag.text_content().strip()
         else:
             # If not found, try to find the title in a <meta> tag with property 'og:title'
-            meta_tag = soup.find('meta', property='og:title')
-            if meta_tag:
-                episode_title_real = meta_tag['content'].strip()
+            meta_tag = page.find('.//meta[@property="og:title"]')
+            if meta_tag is not None:
+                episode_title_real = meta_tag.get('content', "").strip()
             else:
                 # If not found, fall back to the <title> tag and extract the first part
-                full_title = soup.find('title').text.strip()
+                full_title = (page.findtext('.//title') or "").strip()
                 episode_title_real = full_title.split(" - ")[0].strip()
         
         return podcast_id, episode_title_parsed, episode_title_real
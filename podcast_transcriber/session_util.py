@@ -0,0 +1,14 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared HTTP session, keeping connections alive across all the requests made by the script
+session = requests.Session()
+
+# Pool connections per host and retry transient connection failures
+adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(total=2, backoff_factor=0.2))
+session.mount("http://", adapter)
+session.mount("https://", adapter)
+
+# Seconds to wait for a server to connect or send data, passed to every request since a session has no default
+REQUEST_TIMEOUT = 10
@@ -1,45 +1,51 @@
 import wave
 import json
+import functools
 from pydub import AudioSegment
 from vosk import Model, KaldiRecognizer
 import os
 
+@functools.lru_cache(maxsize=2)
+def load_model(model_path):
+    # Load a Vosk model once and reuse it for every file transcribed in the same process
+    return Model(model_path)
+
 def transcribe_audio(audio_file, model_path, audio_dir, transcript_dir):
     # Construct the full path to the audio file in the audio directory
     audio_file_path = os.path.join(audio_dir, audio_file)
 
-    # Load the selected Vosk model using the passed model path
-    model = Model(model_path)
-
-    # Open the audio file using wave
-    wf = wave.open(audio_file_path, "rb")
-
-    # Initialize KaldiRecognizer
-    rec = KaldiRecognizer(model, wf.getframerate())
-
-    # Transcribe audio
-    transcript = ""
-    while True:
-        data = wf.readframes(4000)
-        if len(data) == 0:
-            break
-        if rec.AcceptWaveform(data):
-            result = json.loads(rec.Result())
-            transcript += result['text'] + "\n"
-
-    # Process the final part of the transcription
-    result = json.loads(rec.FinalResult())
-    transcript += result['text']
+    # Load the selected Vosk model using the passed model path (cached across calls)
+    model = load_model(model_path)
 
     # Ensure the transcript directory exists
-    if not os.path.exists(transcript_dir):
-        os.makedirs(transcript_dir)
+    os.makedirs(transcript_dir, exist_ok=True)
 
-    # Save the transcript to a .txt file in the specified transcript directory
+    # Stream the transcript to a .txt file in the specified transcript directory
     txt_file_name = os.path.splitext(os.path.basename(audio_file))[0] + ".txt"
     txt_file_path = os.path.join(transcript_dir, txt_file_name)
-    with open(txt_file_path, "w", encoding="utf-8") as f:
-        f.write(transcript)
+
+    # Open the audio file using wave, making sure it is closed once transcribed
+    with wave.open(audio_file_path, "rb") as wf, \
+            open(txt_file_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        # Initialize KaldiRecognizer
+        rec = KaldiRecognizer(model, wf.getframerate())
+
+        # Feed the recognizer about two seconds of audio per call to reduce per-call overhead
+        block_size = wf.getframerate() * 2
+
+        # Transcribe audio, writing each recognized segment as soon as it is available
+        while True:
+            data = wf.readframes(block_size)
+            if len(data) == 0:
+                break
+            if rec.AcceptWaveform(data):
+                result = json.loads(rec.Result())
+                f.write(result['text'])
+                f.write("\n")
+
+        # Process the final part of the transcription
+        result = json.loads(rec.FinalResult())
+        f.write(result['text'])
 
     # Return only the name of the .txt file, not the full path
     return txt_file_name
@@ -7,35 +7,28 @@ VITAMIN_C = 80.0
 IRON = 14.0
 CALCIUM = 800.0
 
-# Function to calculate the RDA percentage based on the input milligrams
-def calculate(*args):
-	# Calculate and round RDA for Vitamin A if the field is filled
-	if mg_VitaminA.get():
-		try:
-			rda_VitaminA.set(round(float(mg_VitaminA.get()) * 100.0 / VITAMIN_A, 2))
-		except ValueError:
-			rda_VitaminA.set('Invalid input')
-
-	# Calculate and round RDA for Vitamin C if the field is filled
-	if mg_VitaminC.get():
+# Function to calculate the RDA percentage of a single nutrient, clearing it if its field is empty
+def update_rda(mg, rda, factor):
+	value = mg.get()
+	if value:
 		try:
-			rda_VitaminC.set(round(float(mg_VitaminC.get()) * 100.0 / VITAMIN_C, 2))
+			rda.set(round(float(value) * factor, 2))
 		except ValueError:
-			rda_VitaminC.set('Invalid input')
+			rda.set('Invalid input')
+	else:
+		rda.set('')
 
-	# Calculate and round RDA for Iron if the field is filled
-	if mg_Iron.get():
-		try:
-			rda_Iron.set(round(float(mg_Iron.get()) * 100.0 / IRON, 2))
-		except ValueError:
-			rda_Iron.set('Invalid input')
+# Function to create a callback that recalculates only the nutrient whose field changed
+def make_callback(mg, rda, factor):
+	def callback(*args):
+		update_rda(mg, rda, factor)
+	return callback
 
-	# Calculate and round RDA for Calcium if the field is filled
-	if mg_Calcium.get():
-		try:
-			rda_Calcium.set(round(float(mg_Calcium.get()) * 100.0 / CALCIUM, 2))
-		except ValueError:
-			rda_Calcium.set('Invalid input')
+# Function to calculate the RDA percentage based on the input milligrams
+def calculate(*args):
+	# Calculate and round the RDA of every nutrient
+	for mg, rda, factor in RDA_TABLE:
+		update_rda(mg, rda, factor)
 
 # Create the main window
 root = Tk()
@@ -57,6 +50,18 @@ def create_entry_widget(parent, var, col, row):
 mg_VitaminA, mg_VitaminC, mg_Iron, mg_Calcium = StringVar(), StringVar(), StringVar(), StringVar()
 rda_VitaminA, rda_VitaminC, rda_Iron, rda_Calcium = StringVar(), StringVar(), StringVar(), StringVar()
 
+# Pair each input with its output and the precomputed factor converting milligrams to RDA percentage
+RDA_TABLE = (
+	(mg_VitaminA, rda_VitaminA, 100.0 / VITAMIN_A),
+	(mg_VitaminC, rda_VitaminC, 100.0 / VITAMIN_C),
+	(mg_Iron, rda_Iron, 100.0 / IRON),
+	(mg_Calcium, rda_Calcium, 100.0 / CALCIUM),
+)
+
+# Recalculate each RDA as soon as its input field is edited
+for mg, rda, factor in RDA_TABLE:
+	mg.trace_add('write', make_callback(mg, rda, factor))
+
 # Create and place entry widgets for user input
 mg_VitaminA_entry = create_entry_widget(mainframe, mg_VitaminA, 1, 1)
 mg_VitaminC_entry = create_entry_widget(mainframe, mg_VitaminC, 1, 2)
@@ -20,6 +20,12 @@ TIMEOUT_SECONDS = 300  # Time (in seconds) to wait for manual login
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 STEAM_SAVES_ROOT = os.path.join(SCRIPT_DIR, "steam_saves")
 
+# Regular expressions compiled once at module load
+NON_ALPHANUMERIC_RE = re.compile(r'[^a-z0-9]+')
+REMOTESTORAGE_APP_LINK_RE = re.compile(r"remotestorageapp/\?appid=\d+")
+APPID_RE = re.compile(r"appid=(\d+)")
+UNSAFE_FILENAME_CHARS_RE = re.compile(r'[\\/*?:"<>|]')
+
 def snake_case(text: str) -> str:
     """
     Convert a string to snake_case by:
@@ -28,7 +34,7 @@ def snake_case(text: str) -> str:
     - Stripping leading/trailing underscores
     """
     text = text.lower()
-    text = re.sub(r'[^a-z0-9]+', '_', text)
+    text = NON_ALPHANUMERIC_RE.sub('_', text)
     return text.strip('_')
 
 def login_with_selenium():
@@ -89,12 +95,12 @@ def get_appids_from_remotestorage(session):
         return []
 
     soup = BeautifulSoup(resp.text, "html.parser")
-    links = soup.find_all("a", href=re.compile(r"remotestorageapp/\?appid=\d+"))
+    links = soup.find_all("a", href=REMOTESTORAGE_APP_LINK_RE)
 
     appids = set()
     for link in links:
         href = link.get("href", "")
-        match = re.search(r"appid=(\d+)", href)
+        match = APPID_RE.search(href)
         if match:
             appid = match.group(1)
             appids.add(appid)
@@ -184,7 +190,7 @@ def download_saves_for_app(session, appid):
         if not file_url.startswith("http"):
             continue
 
-        safe_file_name = re.sub(r'[\\/*?:"<>|]', "_", file_name)
+        safe_file_name = UNSAFE_FILENAME_CHARS_RE.sub("_", file_name)
 
         print(f"Downloading '{safe_file_name}' (AppID {appid})...")
         file_response = session.get(file_url, stream=True)
@@ -1,40 +1,88 @@
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+
+# Size (in bytes) of the chunks read from the HTTP response
+CHUNK_SIZE = 8192
+
+# Possible meta tags that might contain the publication date, as (attribute, value) pairs
+POSSIBLE_DATE_TAGS = (
+    ('property', 'article:published_time'),
+    ('name', 'date'),
+    ('name', 'pubdate'),
+    ('name', 'article:published_time'),
+    ('name', 'DC.date.issued'),
+    ('itemprop', 'datePublished'),
+    ('property', 'og:published_time'),
+)
+
+# Meta tag attributes used to identify the tags above, derived once so they never drift apart
+META_ATTRIBUTES = tuple(dict.fromkeys(attribute for attribute, _ in POSSIBLE_DATE_TAGS))
+
+# Priority of each meta tag above (lower is better), so a tag is ranked with a single lookup
+DATE_TAG_PRIORITIES = {tag: priority for priority, tag in enumerate(POSSIBLE_DATE_TAGS)}
+
+# Meta tags above that may also appear in the <body>, as microdata, while all the others belong to the <head>
+BODY_DATE_TAGS = (('itemprop', 'datePublished'),)
+
+# Best priority a meta tag can still have once the <head> is over
+BODY_BEST_PRIORITY = min(DATE_TAG_PRIORITIES[tag] for tag in BODY_DATE_TAGS)
 
 def get_publication_date_from_html(url):
-    # Perform the HTTP request to get the content of the page
-    response = requests.get(url)
+    # Perform a streaming HTTP request so the download can stop as soon as the date is found
+    with requests.get(url, stream=True) as response:
+        
+        if response.status_code != 200:
+            return f"Error loading the page: {response.status_code}"
+        
+        # Parse the HTML content of the page incrementally, as it is downloaded
+        parser = etree.HTMLPullParser(events=('start', 'end'))
+        best_priority = None
+        best_possible_priority = 0
+        meta_date = None
+        time_datetime = None
+        time_found = False
+        done = False
+        
+        for chunk in response.iter_content(CHUNK_SIZE):
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if event == 'start' and element.tag == 'meta':
+                    content = element.get('content')
+                    if not content:
+                        continue
+                    # Keep the content of the meta tag if it ranks better than the current one
+                    for attribute in META_ATTRIBUTES:
+                        priority = DATE_TAG_PRIORITIES.get((attribute, element.get(attribute)))
+                        if priority is not None and (best_priority is None or priority < best_priority):
+                            best_priority = priority
+                            meta_date = content
+                    # Stop immediately if no tag still to come can rank better
+                    if best_priority is not None and best_priority <= best_possible_priority:
+                        done = True
+                        break
+                elif event == 'start' and element.tag == 'time' and not time_found:
+                    # Remember the first <time> tag, used as a fallback
+                    time_found = True
+                    time_datetime = element.get('datetime')
+                elif event == 'end' and element.tag == 'head':
+                    # Only the tags allowed in the <body> can follow, so stop if none of them can rank better
+                    best_possible_priority = BODY_BEST_PRIORITY
+                    if best_priority is not None and best_priority <= best_possible_priority:
+                        done = True
+                        break
+            if done:
+                break
     
-    if response.status_code != 200:
-        return f"Error loading the page: {response.status_code}"
-    
-    # Parse the HTML content of the page
-    soup = BeautifulSoup(response.content, 'html.parser')
-    
-    # Possible tags that might contain the publication date
-    possible_date_tags = [
-        {'property': 'article:published_time'},
-        {'name': 'date'},
-        {'name': 'pubdate'},
-        {'name': 'article:published_time'},
-        {'name': 'DC.date.issued'},
-        {'itemprop': 'datePublished'},
-        {'property': 'og:published_time'},
-    ]
-    
-    # Search for the date in the meta tags
-    for tag in possible_date_tags:
-        meta_tag = soup.find('meta', tag)
-        if meta_tag and meta_tag.get('content'):
-            # Split the date to remove the time if it exists
-            publication_date = meta_tag['content'].split("T")[0]
-            return f"Publication date found: {publication_date}"
+    # Use the date of the highest priority meta tag if any was found
+    if meta_date:
+        # Split the date to remove the time if it exists
+        publication_date = meta_date.split("T")[0]
+        return f"Publication date found: {publication_date}"
     
     # Also search the <time> tag if it exists
-    time_tag = soup.find('time')
-    if time_tag and time_tag.get('datetime'):
+    if time_datetime:
         # Split the date to remove the time if it exists
-        publication_date = time_tag['datetime'].split("T")[0]
+        publication_date = time_datetime.split("T")[0]
         return f"Publication date found: {publication_date}"
     
     return "Publication date not found in the metadata."